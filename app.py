@@ -4,8 +4,24 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import os
-from utils.data_processor import load_data, get_unique_values, filter_data, calculate_market_indicators
-from utils.visualization import create_sales_trend_chart, create_indicator_chart
+from dataclasses import dataclass
+from utils.data_processor import load_data, get_unique_values, calculate_market_indicators
+from utils.visualization import (
+    create_sales_trend_chart,
+    create_indicator_chart,
+    create_market_share_chart,
+    create_brand_performance_chart
+)
+from utils.dashboard_helpers import (
+    make_filters_key,
+    downsample_min_max,
+    top_n_with_other,
+    create_price_histogram,
+    to_webgl,
+    read_parquet_cache,
+    write_parquet_cache,
+    prepare_dtypes
+)
 
 # Page config
 st.set_page_config(
@@ -24,17 +40,245 @@ colors = {
     "text": "#212121"
 }
 
+# Location of the sales data consumed by load_data()
+DATA_PATH = 'data/automotive_sales.csv'
+
+# Columnar copy of the prepared data, rebuilt whenever the CSV changes
+PARQUET_PATH = 'data/automotive_sales.parquet'
+
+# Bump whenever load_cached_data() changes how the data is prepared
+DATA_PREP_VERSION = '2'
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORY_COLUMNS = ('brand', 'region', 'vehicle_type', 'fuel_type')
+
 # Initialize session state for filters
 if 'filters' not in st.session_state:
     st.session_state.filters = {}
 
+@st.cache_resource(ttl=3600, show_spinner=False)
+def load_cached_data(mtime):
+    """Load and prepare the sales data once per CSV version (``mtime`` is the cache key).
+
+    The returned frame is shared across reruns; treat it as read-only.
+    """
+    cache_metadata = {b'source_mtime': repr(mtime).encode(), b'prep_version': DATA_PREP_VERSION.encode()}
+
+    # Reuse the Parquet copy only if it was built from this exact CSV by this prep logic
+    if mtime is not None:
+        data = read_parquet_cache(PARQUET_PATH, cache_metadata)
+        if data is not None:
+            # Parquet does not keep every pandas dtype, so re-apply them
+            return prepare_dtypes(data, CATEGORY_COLUMNS)
+
+    data = load_data()
+    if data is None:
+        return None
+
+    data = prepare_dtypes(data, CATEGORY_COLUMNS)
+
+    # Sorted dates let the date filter slice with searchsorted
+    if 'date' in data.columns:
+        data = data.sort_values('date', kind='stable', ignore_index=True)
+
+    # Cache as Parquet for the next cold start
+    write_parquet_cache(data, PARQUET_PATH, cache_metadata)
+
+    return data
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_cached_unique_values(_data, data_key, column):
+    """Unique values of ``column``, computed once per data version."""
+    return get_unique_values(_data, column)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_filtered_data(_data, data_key, filters_key):
+    """Apply the sidebar filters, memoized per data version and filter state.
+
+    The result is shared across reruns; callers take a shallow copy.
+    """
+    # Combine the per-column masks in one pass and index the frame once
+    masks = [_data[col].isin(vals).to_numpy() for col, vals in filters_key if col in _data.columns]
+    if not masks:
+        return _data
+    return _data.iloc[np.logical_and.reduce(masks)]
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_daily_sales(_filtered_data, data_key, filters_key):
+    """Total ``sales_count`` per day for the current data version and filters."""
+    # floor('D') keeps the groupby key datetime64 rather than Python dates
+    daily = _filtered_data.groupby(_filtered_data['date'].dt.floor('D'))['sales_count'].sum().reset_index()
+    daily.columns = ['date', 'sales_count']
+    return daily
+
+@dataclass(frozen=True)
+class IndicatorDisplay:
+    """Market indicators pre-formatted for the ``st.metric`` widgets."""
+    total_sales: str
+    avg_price: str
+    price_trend: str | None
+    sales_growth: str
+    top_brand: str | None
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_market_indicators(_filtered_data, data_key, filters_key):
+    """Formatted market indicators for the current data version and filters."""
+    indicators = calculate_market_indicators(_filtered_data)
+    return IndicatorDisplay(
+        total_sales=f"{indicators['total_sales']:,}",
+        avg_price=f"${indicators['avg_price']:,.2f}",
+        price_trend=f"{indicators['price_trend']:.1f}%" if indicators['price_trend'] != 0 else None,
+        sales_growth=f"{indicators['sales_growth']:.1f}%",
+        top_brand=str(indicators['top_brand']) if indicators['top_brand'] is not None else None
+    )
+
+def render_indicators(filtered_data, data_key, filters_key):
+    """Key market indicator metrics."""
+    # Calculate market indicators
+    indicators = get_market_indicators(filtered_data, data_key, filters_key)
+    
+    # Key metrics row
+    st.subheader("Key Market Indicators")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="Total Sales",
+            value=indicators.total_sales,
+            delta=None
+        )
+    
+    with col2:
+        st.metric(
+            label="Average Price",
+            value=indicators.avg_price,
+            delta=indicators.price_trend
+        )
+    
+    with col3:
+        st.metric(
+            label="Sales Growth",
+            value=indicators.sales_growth,
+            delta=None
+        )
+    
+    with col4:
+        st.metric(
+            label="Top Brand",
+            value=indicators.top_brand,
+            delta=None
+        )
+
+def render_sales_trend(filtered_data, data_key, filters_key):
+    """Daily sales trend chart."""
+    # Sales Trend Chart
+    st.subheader("Recent Sales Trends")
+    
+    # Check if we have the necessary columns for a trend chart
+    if 'date' in filtered_data.columns and 'sales_count' in filtered_data.columns:
+        # Group by date
+        sales_trend_data = get_daily_sales(filtered_data, data_key, filters_key).copy(deep=False)
+        
+        # Create and display chart
+        sales_chart = create_sales_trend_chart(
+            downsample_min_max(sales_trend_data, 'sales_count'),
+            x_col='date',
+            y_col='sales_count',
+            title='Daily Sales Trend'
+        )
+        st.plotly_chart(to_webgl(sales_chart), use_container_width=True)
+    else:
+        st.warning("Unable to generate sales trend chart. Required columns not found in data.")
+
+def render_market_share(filtered_data):
+    """Brand market share chart."""
+    st.subheader("Brand Market Share")
+    if 'brand' in filtered_data.columns:
+        # Pre-aggregate per brand; observed=True skips unused categories
+        if 'sales_count' in filtered_data.columns:
+            share_value_col = 'sales_count'
+            brand_totals = filtered_data.groupby('brand', observed=True)['sales_count'].sum()
+        else:
+            share_value_col = 'count'
+            brand_totals = filtered_data.groupby('brand', observed=True).size()
+        
+        brand_share = top_n_with_other(brand_totals, n=10)
+        share_data = pd.DataFrame({
+            'brand': brand_share.index,
+            share_value_col: brand_share.to_numpy()
+        })
+        
+        market_share_chart = create_market_share_chart(
+            share_data,
+            category_col='brand',
+            value_col=share_value_col,
+            title='Brand Market Share'
+        )
+        st.plotly_chart(market_share_chart, use_container_width=True)
+    else:
+        st.warning("Brand information not available in data.")
+
+def render_price_distribution(filtered_data):
+    """Price distribution chart."""
+    st.subheader("Price Distribution")
+    if 'price' in filtered_data.columns:
+        price_dist_chart = create_price_histogram(
+            filtered_data['price'],
+            title='Price Distribution',
+            color=colors['primary']
+        )
+        st.plotly_chart(price_dist_chart, use_container_width=True)
+    else:
+        st.warning("Price information not available in data.")
+
+def render_vehicle_types(filtered_data):
+    """Sales by vehicle type chart."""
+    # Bottom section with additional insight
+    st.subheader("Additional Insights")
+    
+    if 'vehicle_type' in filtered_data.columns and 'sales_count' in filtered_data.columns:
+        # Pre-aggregate to one row per vehicle type; observed=True skips unused categories
+        vehicle_type_sales = filtered_data.groupby('vehicle_type', observed=True)['sales_count'].sum()
+        vehicle_type_data = pd.DataFrame({
+            'vehicle_type': vehicle_type_sales.index.astype(str),
+            'sales_count': vehicle_type_sales.to_numpy()
+        })
+        
+        vehicle_type_chart = create_brand_performance_chart(
+            vehicle_type_data,
+            brand_col='vehicle_type',
+            value_col='sales_count',
+            title='Sales by Vehicle Type'
+        )
+        st.plotly_chart(vehicle_type_chart, use_container_width=True)
+    elif 'vehicle_type' in filtered_data.columns:
+        # If no sales_count column, we'll just count rows
+        vehicle_type_counts = filtered_data.groupby('vehicle_type', observed=True).size().sort_values(ascending=False)
+        vehicle_type_data = pd.DataFrame({
+            'vehicle_type': vehicle_type_counts.index.astype(str),
+            'count': vehicle_type_counts.to_numpy()
+        })
+        
+        vehicle_type_chart = create_brand_performance_chart(
+            vehicle_type_data,
+            brand_col='vehicle_type',
+            value_col='count',
+            title='Count by Vehicle Type'
+        )
+        st.plotly_chart(vehicle_type_chart, use_container_width=True)
+    else:
+        st.info("Navigate to other pages using the sidebar to explore more detailed analyses.")
+
 def main():
     # Header
     st.title("🚗 Automotive Market Analysis Dashboard")
     st.markdown("### Comprehensive automotive sales data analysis and visualization")
     
-    # Load data
-    data = load_data()
+    # Load data (cached across reruns, keyed by the data file's mtime)
+    data_mtime = os.path.getmtime(DATA_PATH) if os.path.exists(DATA_PATH) else None
+    data = load_cached_data(data_mtime)
+    data_key = (data_mtime,)
     
     # Check if data exists
     if data is None:
@@ -75,54 +319,52 @@ def main():
             
             if len(date_range) == 2:
                 start_date, end_date = date_range
-                data = data[(data['date'].dt.date >= start_date) & (data['date'].dt.date <= end_date)]
+                # Data is sorted by date, so the range is a contiguous slice
+                lo, hi = data['date'].values.searchsorted(
+                    [np.datetime64(start_date), np.datetime64(end_date) + np.timedelta64(1, 'D')]
+                )
+                data = data.iloc[lo:hi]
+                data_key = (data_mtime, start_date, end_date)
         
-        # Brand filter
+        # Brand filter (an empty selection means all brands)
         if 'brand' in data.columns:
-            brand_options = ['All'] + get_unique_values(data, 'brand')
-            selected_brands = st.multiselect("Brand", brand_options, default="All")
+            brand_options = get_cached_unique_values(data, data_key, 'brand')
+            selected_brands = st.multiselect("Brand", brand_options, default=[], placeholder="All")
             
-            if 'All' not in selected_brands and selected_brands:
+            if selected_brands:
                 st.session_state.filters['brand'] = selected_brands
             else:
-                if 'brand' in st.session_state.filters:
-                    del st.session_state.filters['brand']
+                st.session_state.filters.pop('brand', None)
         
         # Year filter
         if 'year' in data.columns:
-            year_options = ['All'] + [str(year) for year in get_unique_values(data, 'year')]
-            selected_years = st.multiselect("Year", year_options, default="All")
+            year_options = get_cached_unique_values(data, data_key, 'year')
+            selected_years = st.multiselect("Year", year_options, default=[], placeholder="All")
             
-            if 'All' not in selected_years and selected_years:
-                st.session_state.filters['year'] = [int(year) for year in selected_years if year != 'All']
+            if selected_years:
+                st.session_state.filters['year'] = [int(year) for year in selected_years]
             else:
-                if 'year' in st.session_state.filters:
-                    del st.session_state.filters['year']
+                st.session_state.filters.pop('year', None)
         
         # Region filter
         if 'region' in data.columns:
-            region_options = ['All'] + get_unique_values(data, 'region')
-            selected_regions = st.multiselect("Region", region_options, default="All")
+            region_options = get_cached_unique_values(data, data_key, 'region')
+            selected_regions = st.multiselect("Region", region_options, default=[], placeholder="All")
             
-            if 'All' not in selected_regions and selected_regions:
+            if selected_regions:
                 st.session_state.filters['region'] = selected_regions
             else:
-                if 'region' in st.session_state.filters:
-                    del st.session_state.filters['region']
+                st.session_state.filters.pop('region', None)
         
         # Vehicle type filter
         if 'vehicle_type' in data.columns:
-            vehicle_type_options = ['All'] + get_unique_values(data, 'vehicle_type')
-            selected_vehicle_types = st.multiselect("Vehicle Type", vehicle_type_options, default="All")
+            vehicle_type_options = get_cached_unique_values(data, data_key, 'vehicle_type')
+            selected_vehicle_types = st.multiselect("Vehicle Type", vehicle_type_options, default=[], placeholder="All")
             
-            if 'All' not in selected_vehicle_types and selected_vehicle_types:
+            if selected_vehicle_types:
                 st.session_state.filters['vehicle_type'] = selected_vehicle_types
             else:
-                if 'vehicle_type' in st.session_state.filters:
-                    del st.session_state.filters['vehicle_type']
-        
-        # Apply all filters
-        filtered_data = filter_data(data, st.session_state.filters)
+                st.session_state.filters.pop('vehicle_type', None)
         
         # Reset filters button
         if st.button("Reset Filters"):
@@ -146,130 +388,28 @@ def main():
     
     # Main area - Overview Dashboard
     
-    # Apply filters
-    filtered_data = filter_data(data, st.session_state.filters)
+    # Apply all filters once; everything below reuses this frame
+    filters_key = make_filters_key(st.session_state.filters)
+    filtered_data = get_filtered_data(data, data_key, filters_key).copy(deep=False)
     
-    # Calculate market indicators
-    indicators = calculate_market_indicators(filtered_data)
-    
-    # Key metrics row
-    st.subheader("Key Market Indicators")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="Total Sales",
-            value=f"{indicators['total_sales']:,}",
-            delta=None
-        )
-    
-    with col2:
-        st.metric(
-            label="Average Price",
-            value=f"${indicators['avg_price']:,.2f}",
-            delta=f"{indicators['price_trend']:.1f}%" if indicators['price_trend'] != 0 else None
-        )
-    
-    with col3:
-        st.metric(
-            label="Sales Growth",
-            value=f"{indicators['sales_growth']:.1f}%",
-            delta=None
-        )
-    
-    with col4:
-        st.metric(
-            label="Top Brand",
-            value=indicators['top_brand'],
-            delta=None
-        )
+    render_indicators(filtered_data, data_key, filters_key)
     
     st.markdown("---")
     
-    # Sales Trend Chart
-    st.subheader("Recent Sales Trends")
-    
-    # Check if we have the necessary columns for a trend chart
-    if 'date' in filtered_data.columns and 'sales_count' in filtered_data.columns:
-        # Group by date
-        sales_trend_data = filtered_data.groupby(filtered_data['date'].dt.date)['sales_count'].sum().reset_index()
-        sales_trend_data.columns = ['date', 'sales_count']
-        
-        # Create and display chart
-        sales_chart = create_sales_trend_chart(
-            sales_trend_data,
-            x_col='date',
-            y_col='sales_count',
-            title='Daily Sales Trend'
-        )
-        st.plotly_chart(sales_chart, use_container_width=True)
-    else:
-        st.warning("Unable to generate sales trend chart. Required columns not found in data.")
+    render_sales_trend(filtered_data, data_key, filters_key)
     
     # Two column layout for additional charts
     col1, col2 = st.columns(2)
     
     with col1:
-        st.subheader("Brand Market Share")
-        if 'brand' in filtered_data.columns:
-            from utils.visualization import create_market_share_chart
-            
-            market_share_chart = create_market_share_chart(
-                filtered_data,
-                category_col='brand',
-                value_col='sales_count' if 'sales_count' in filtered_data.columns else None,
-                title='Brand Market Share'
-            )
-            st.plotly_chart(market_share_chart, use_container_width=True)
-        else:
-            st.warning("Brand information not available in data.")
+        render_market_share(filtered_data)
     
     with col2:
-        st.subheader("Price Distribution")
-        if 'price' in filtered_data.columns:
-            from utils.visualization import create_price_distribution_chart
-            
-            price_dist_chart = create_price_distribution_chart(
-                filtered_data,
-                price_col='price',
-                title='Price Distribution'
-            )
-            st.plotly_chart(price_dist_chart, use_container_width=True)
-        else:
-            st.warning("Price information not available in data.")
+        render_price_distribution(filtered_data)
     
     st.markdown("---")
     
-    # Bottom section with additional insight
-    st.subheader("Additional Insights")
-    
-    if 'vehicle_type' in filtered_data.columns and 'sales_count' in filtered_data.columns:
-        from utils.visualization import create_brand_performance_chart
-        
-        vehicle_type_chart = create_brand_performance_chart(
-            filtered_data,
-            brand_col='vehicle_type',
-            value_col='sales_count',
-            title='Sales by Vehicle Type'
-        )
-        st.plotly_chart(vehicle_type_chart, use_container_width=True)
-    elif 'vehicle_type' in filtered_data.columns:
-        from utils.visualization import create_brand_performance_chart
-        
-        # If no sales_count column, we'll just count rows
-        vehicle_type_data = filtered_data['vehicle_type'].value_counts().reset_index()
-        vehicle_type_data.columns = ['vehicle_type', 'count']
-        
-        vehicle_type_chart = create_brand_performance_chart(
-            vehicle_type_data,
-            brand_col='vehicle_type',
-            value_col='count',
-            title='Count by Vehicle Type'
-        )
-        st.plotly_chart(vehicle_type_chart, use_container_width=True)
-    else:
-        st.info("Navigate to other pages using the sidebar to explore more detailed analyses.")
+    render_vehicle_types(filtered_data)
 
 if __name__ == "__main__":
     main()
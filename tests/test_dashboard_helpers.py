@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from utils.dashboard_helpers import (
+    make_filters_key,
+    downsample_min_max,
+    top_n_with_other,
+    create_price_histogram,
+    to_webgl,
+    read_parquet_cache,
+    write_parquet_cache,
+    prepare_dtypes
+)
+
+
+def test_make_filters_key_ignores_order():
+    key_a = make_filters_key({'brand': ['b', 'a'], 'year': [2021, 2020]})
+    key_b = make_filters_key({'year': [2020, 2021], 'brand': ['a', 'b']})
+
+    assert key_a == key_b
+    assert hash(key_a) == hash(key_b)
+
+
+def test_downsample_min_max_keeps_extremes():
+    df = pd.DataFrame({'sales_count': np.arange(10_000) % 97})
+    df.loc[4321, 'sales_count'] = 1_000
+
+    result = downsample_min_max(df, 'sales_count', n_bins=100)
+
+    assert len(result) <= 200
+    assert result.index.is_monotonic_increasing
+    assert 4321 in result.index
+
+
+def test_downsample_min_max_leaves_short_series():
+    df = pd.DataFrame({'sales_count': [1, 2, 3]})
+
+    assert downsample_min_max(df, 'sales_count', n_bins=10) is df
+
+
+def test_top_n_with_other_folds_the_rest():
+    totals = pd.Series({'a': 5, 'b': 4, 'c': 3, 'd': 2})
+
+    result = top_n_with_other(totals, n=2)
+
+    assert result.to_dict() == {'a': 5, 'b': 4, 'Other brands': 5}
+
+
+def test_top_n_with_other_avoids_clashing_label():
+    totals = pd.Series({'Other brands': 9, 'b': 4, 'c': 3})
+
+    result = top_n_with_other(totals, n=2)
+
+    assert result.to_dict() == {'Other brands': 9, 'b': 4, 'Other brands (rest)': 3}
+
+
+def test_create_price_histogram_bins_server_side():
+    prices = pd.Series([10_000.0, 20_000.0, np.nan, 30_000.0, 40_000.0])
+
+    fig = create_price_histogram(prices, title='Price Distribution', bins=4)
+
+    assert fig.data[0].type == 'bar'
+    assert len(fig.data[0].y) == 4
+    assert fig.data[0].y.sum() == 4
+
+
+def test_to_webgl_converts_px_line_traces():
+    df = pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=5),
+        'sales_count': [3, 1, 4, 1, 5]
+    })
+    fig = px.line(df, x='date', y='sales_count', line_shape='spline', markers=True)
+
+    webgl_fig = to_webgl(fig)
+
+    assert [trace.type for trace in webgl_fig.data] == ['scattergl']
+
+
+def test_parquet_cache_round_trip(tmp_path):
+    path = str(tmp_path / 'sales.parquet')
+    data = pd.DataFrame({'brand': pd.Categorical(['a', 'b']), 'sales_count': [1, 2]})
+    metadata = {b'source_mtime': b'1.0', b'prep_version': b'1'}
+
+    write_parquet_cache(data, path, metadata)
+
+    pd.testing.assert_frame_equal(read_parquet_cache(path, metadata), data)
+
+
+def test_parquet_cache_rejects_mismatched_metadata(tmp_path):
+    path = str(tmp_path / 'sales.parquet')
+    data = pd.DataFrame({'sales_count': [1, 2]})
+    write_parquet_cache(data, path, {b'source_mtime': b'1.0', b'prep_version': b'1'})
+
+    assert read_parquet_cache(path, {b'source_mtime': b'2.0', b'prep_version': b'1'}) is None
+    assert read_parquet_cache(path, {b'source_mtime': b'1.0', b'prep_version': b'2'}) is None
+
+
+def test_parquet_cache_ignores_corrupt_file(tmp_path):
+    path = tmp_path / 'sales.parquet'
+    path.write_bytes(b'not a parquet file')
+
+    assert read_parquet_cache(str(path), {b'prep_version': b'1'}) is None
+
+
+def test_parquet_cache_missing_file(tmp_path):
+    assert read_parquet_cache(str(tmp_path / 'missing.parquet'), {}) is None
+
+
+def test_prepare_dtypes_converts_text_columns():
+    data = pd.DataFrame({
+        'brand': ['a', 'b', 'a'],
+        'model': ['x', 'y', None],
+        'mixed': ['x', 1, 'z'],
+        'sales_count': [1, 2, 3]
+    })
+
+    result = prepare_dtypes(data, ('brand', 'region'))
+
+    assert isinstance(result['brand'].dtype, pd.CategoricalDtype)
+    assert result['model'].dtype == pd.StringDtype('pyarrow')
+    assert result['mixed'].dtype == object
+    assert result['sales_count'].dtype == np.int64
+
+
+def test_prepare_dtypes_survives_parquet_round_trip(tmp_path):
+    path = str(tmp_path / 'sales.parquet')
+    metadata = {b'prep_version': b'2'}
+    data = prepare_dtypes(pd.DataFrame({'brand': ['a', 'b'], 'model': ['x', 'y']}), ('brand',))
+
+    write_parquet_cache(data, path, metadata)
+    cached = prepare_dtypes(read_parquet_cache(path, metadata), ('brand',))
+
+    pd.testing.assert_series_equal(cached.dtypes, data.dtypes)
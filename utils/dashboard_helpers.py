@@ -0,0 +1,141 @@
+"""Dashboard helpers that do not depend on Streamlit, so they can be tested directly."""
+
+import os
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+def make_filters_key(filters):
+    """Turn the filters dict into a hashable, order-independent cache key."""
+    return tuple(sorted((col, tuple(sorted(vals))) for col, vals in filters.items()))
+
+def downsample_min_max(df, y_col, n_bins=500):
+    """Keep each bucket's min and max ``y_col`` rows, at most ``2 * n_bins`` rows in total."""
+    n = len(df)
+    if n <= 2 * n_bins:
+        return df
+
+    y = df[y_col].to_numpy()
+    edges = np.linspace(0, n, n_bins + 1).astype(int)
+    bin_ids = np.repeat(np.arange(n_bins), np.diff(edges))
+
+    # Sort by (bin, value): each bin's first entry is its min, its last is its max
+    order = np.lexsort((y, bin_ids))
+    keep = np.unique(np.concatenate([order[edges[:-1]], order[edges[1:] - 1]]))
+    return df.iloc[keep]
+
+def top_n_with_other(totals, n=10, other_label='Other brands'):
+    """Keep the ``n`` largest entries of ``totals`` and fold the rest into ``other_label``."""
+    top = totals.nlargest(n)
+    top.index = top.index.astype(str)
+    other = totals.sum() - top.sum()
+    if other > 0:
+        # Never reuse a real category's name for the catch-all bucket
+        while other_label in top.index:
+            other_label += ' (rest)'
+        top = pd.concat([top, pd.Series([other], index=[other_label])])
+    return top
+
+def create_price_histogram(prices, title, bins=50, color=None):
+    """Price distribution as a bar chart of server-side histogram counts."""
+    values = prices.to_numpy(dtype=float)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color=color,
+        hovertemplate='Price: $%{x:,.0f}<br>Count: %{y:,}<extra></extra>'
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title='Price',
+        yaxis_title='Count',
+        bargap=0
+    )
+    return fig
+
+# Scatter properties that scattergl rejects, dropped when converting traces
+SCATTER_ONLY_PROPS = (
+    'orientation', 'stackgroup', 'stackgaps', 'groupnorm', 'alignmentgroup',
+    'offsetgroup', 'cliponaxis', 'hoveron', 'fillpattern', 'fillgradient', 'zorder'
+)
+SCATTER_ONLY_LINE_PROPS = ('smoothing', 'simplify', 'backoff')
+SCATTER_ONLY_MARKER_PROPS = ('angleref', 'gradient', 'maxdisplayed', 'standoff')
+
+def to_webgl(fig):
+    """Return ``fig`` with its scatter/line traces rendered via WebGL (scattergl)."""
+    traces = []
+    for trace in fig.data:
+        if trace.type == 'scatter':
+            props = trace.to_plotly_json()
+            props.pop('type', None)
+            for key in SCATTER_ONLY_PROPS:
+                props.pop(key, None)
+            line = props.get('line', {})
+            for key in SCATTER_ONLY_LINE_PROPS:
+                line.pop(key, None)
+            if line.get('shape') == 'spline':
+                line['shape'] = 'linear'
+            marker = props.get('marker', {})
+            for key in SCATTER_ONLY_MARKER_PROPS:
+                marker.pop(key, None)
+            trace = go.Scattergl(props)
+        traces.append(trace)
+    return go.Figure(data=traces, layout=fig.layout)
+
+ARROW_STRING = pd.StringDtype('pyarrow')
+
+def prepare_dtypes(data, category_columns):
+    """Convert ``category_columns`` to categoricals and other text columns to Arrow strings."""
+    # Categoricals let isin() filtering work on integer codes
+    for col in category_columns:
+        if col in data.columns and not isinstance(data[col].dtype, pd.CategoricalDtype):
+            data[col] = data[col].astype('category')
+
+    # Remaining text columns (e.g. model) move to Arrow-backed strings, which
+    # live in contiguous buffers instead of one Python object per row. Text
+    # may arrive as object, string[python] or pandas 3's default str dtype.
+    for col in data.columns:
+        dtype = data[col].dtype
+        if dtype == object:
+            is_text = pd.api.types.infer_dtype(data[col], skipna=True) == 'string'
+        else:
+            is_text = isinstance(dtype, pd.StringDtype) and dtype != ARROW_STRING
+        if is_text:
+            data[col] = data[col].astype(ARROW_STRING)
+
+    return data
+
+def read_parquet_cache(path, metadata):
+    """Read the Parquet cache at ``path`` if its schema metadata matches ``metadata``.
+
+    Returns None when the file is missing, stale or unreadable.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        stored = pq.read_schema(path).metadata or {}
+        if all(stored.get(key) == value for key, value in metadata.items()):
+            return pq.read_table(path).to_pandas()
+    except (OSError, ValueError, pa.ArrowException):
+        pass
+    return None
+
+def write_parquet_cache(data, path, metadata):
+    """Write ``data`` to ``path`` as Parquet, tagged with ``metadata``.
+
+    Best effort: a read-only data directory just means no cache.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError, pa.ArrowException):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)